@@ -1,6 +1,9 @@
+from typing import AsyncIterator
+
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from database import SessionLocal
+from database import AsyncSessionLocal, SessionLocal
 
 
 def get_db() -> Session:
@@ -10,3 +13,8 @@ def get_db() -> Session:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,172 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from src import models
+from src.cache import invalidate_workflow
+from src.schemas import (
+    NodeCreate,
+    MessageNodeCreate,
+    ConditionNodeCreate,
+    EdgeCreate,
+    WorkflowCreate
+)
+
+
+async def create_workflow(
+        db: AsyncSession, workflow: WorkflowCreate
+) -> models.DBWorkflow:
+    db_workflow = models.DBWorkflow(name=workflow.name)
+    db.add(db_workflow)
+    await db.commit()
+    await db.refresh(db_workflow)
+
+    return db_workflow
+
+
+async def get_workflow(db: AsyncSession, workflow_id: int) -> models.DBWorkflow:
+    return await db.scalar(
+        select(models.DBWorkflow).where(models.DBWorkflow.id == workflow_id)
+    )
+
+
+async def get_all_workflows(db: AsyncSession) -> list[models.DBWorkflow]:
+    result = await db.scalars(select(models.DBWorkflow))
+    return list(result)
+
+
+async def update_workflow(
+        db: AsyncSession, workflow_id: int, workflow: WorkflowCreate
+) -> models.DBWorkflow:
+    db_workflow = await get_workflow(db, workflow_id)
+    db_workflow.name = workflow.name
+    await db.commit()
+    await db.refresh(db_workflow)
+
+    return db_workflow
+
+
+async def delete_workflow(db: AsyncSession, workflow_id: int) -> models.DBWorkflow:
+    # Children are loaded up front so the unit of work never lazy loads
+    db_workflow = await db.scalar(
+        select(models.DBWorkflow).options(
+            selectinload(models.DBWorkflow.nodes),
+            selectinload(models.DBWorkflow.edges),
+        ).where(models.DBWorkflow.id == workflow_id)
+    )
+    await db.delete(db_workflow)
+    await db.commit()
+    invalidate_workflow(workflow_id)
+    return db_workflow
+
+
+async def create_node(db: AsyncSession, node: NodeCreate) -> models.DBNode:
+    db_node = models.DBNode(
+        node_type=node.node_type,
+        workflow_id=node.workflow_id
+    )
+    db.add(db_node)
+    await db.commit()
+    await db.refresh(db_node, ["workflow"])
+    invalidate_workflow(db_node.workflow_id)
+
+    return db_node
+
+
+async def get_all_nodes(db: AsyncSession) -> list[models.DBNode]:
+    result = await db.scalars(
+        select(models.DBNode).options(selectinload(models.DBNode.workflow))
+    )
+    return list(result)
+
+
+async def get_node_by_id(db: AsyncSession, node_id: int) -> models.DBNode:
+    return await db.scalar(
+        select(models.DBNode).options(
+            selectinload(models.DBNode.workflow)
+        ).where(models.DBNode.id == node_id)
+    )
+
+
+async def delete_node(db: AsyncSession, node_id: int) -> models.DBNode:
+    node = await get_node_by_id(db, node_id)
+    await db.delete(node)
+    await db.commit()
+    invalidate_workflow(node.workflow_id)
+    return node
+
+
+async def create_message_node(
+        db: AsyncSession, message_node: MessageNodeCreate
+) -> models.DBNode:
+    db_message_node = models.DBNode(
+        workflow_id=message_node.workflow_id,
+        node_type=message_node.node_type,
+        text=message_node.text,
+        status=message_node.status
+    )
+    db.add(db_message_node)
+    await db.commit()
+    await db.refresh(db_message_node, ["workflow"])
+    invalidate_workflow(db_message_node.workflow_id)
+
+    return db_message_node
+
+
+async def update_message_node(
+        db: AsyncSession, node_id: int, data: MessageNodeCreate
+) -> models.DBNode:
+    node = await get_node_by_id(db, node_id=node_id)
+    previous_workflow_id = node.workflow_id
+    for var, value in vars(data).items():
+        setattr(node, var, value)
+    await db.commit()
+    await db.refresh(node, ["workflow"])
+    invalidate_workflow(previous_workflow_id)
+    invalidate_workflow(node.workflow_id)
+    return node
+
+
+async def create_condition_node(
+        db: AsyncSession, condition_node: ConditionNodeCreate
+) -> models.DBNode:
+    db_condition_node = models.DBNode(
+        workflow_id=condition_node.workflow_id,
+        node_type=condition_node.node_type,
+        condition=condition_node.condition,
+    )
+    db.add(db_condition_node)
+    await db.commit()
+    await db.refresh(db_condition_node, ["workflow"])
+    invalidate_workflow(db_condition_node.workflow_id)
+
+    return db_condition_node
+
+
+async def update_condition_node(
+        db: AsyncSession, node_id: int, data: ConditionNodeCreate
+) -> models.DBNode:
+    node = await get_node_by_id(db, node_id=node_id)
+    previous_workflow_id = node.workflow_id
+    for var, value in vars(data).items():
+        setattr(node, var, value)
+    await db.commit()
+    await db.refresh(node, ["workflow"])
+    invalidate_workflow(previous_workflow_id)
+    invalidate_workflow(node.workflow_id)
+    return node
+
+
+async def create_edge(db: AsyncSession, edge: EdgeCreate) -> models.DBEdge:
+    db_edge = models.DBEdge(
+        name=edge.name,
+        start_node_id=edge.start_node_id,
+        end_node_id=edge.end_node_id,
+        workflow_id=edge.workflow_id
+    )
+    db.add(db_edge)
+    await db.commit()
+    await db.refresh(db_edge, ["workflow"])
+    invalidate_workflow(db_edge.workflow_id)
+
+    return db_edge
@@ -0,0 +1,98 @@
+import os
+import threading
+from collections import OrderedDict
+from typing import Any
+
+WORKFLOW_CACHE_SIZE = int(os.getenv("WORKFLOW_CACHE_SIZE", "256"))
+RENDER_CACHE_SIZE = int(os.getenv("RENDER_CACHE_SIZE", "64"))
+
+
+class WorkflowCache:
+    """LRU cache of data derived from workflows, keyed by workflow id and version.
+
+    Every write to a workflow bumps its version through `invalidate`, so an
+    entry compiled from an older version can never be returned again.
+    """
+
+    def __init__(self, max_size: int = WORKFLOW_CACHE_SIZE) -> None:
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[tuple[int, int, str], Any] = OrderedDict()
+        self._versions: dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    def version(self, workflow_id: int) -> int:
+        """Return the current version of the workflow."""
+
+        return self._versions.get(workflow_id, 0)
+
+    def get(self, workflow_id: int, variant: str = "") -> Any | None:
+        """Return the cached entry for the current workflow version."""
+
+        with self._lock:
+            key = (workflow_id, self.version(workflow_id), variant)
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(
+            self, workflow_id: int, version: int, value: Any, variant: str = ""
+    ) -> None:
+        """Store an entry compiled from the given workflow version.
+
+        Entries compiled from a version that was invalidated in the meantime
+        are dropped instead of being stored.
+        """
+
+        with self._lock:
+            if version != self.version(workflow_id):
+                return
+            key = (workflow_id, version, variant)
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, workflow_id: int) -> None:
+        """Bump the workflow version and drop its cached entries."""
+
+        with self._lock:
+            self._versions[workflow_id] = self.version(workflow_id) + 1
+            for key in [key for key in self._entries if key[0] == workflow_id]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        """Drop all entries and reset the counters."""
+
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        """Return hit and miss counters along with the cache size."""
+
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "size": len(self._entries),
+            "max_size": self.max_size,
+        }
+
+
+workflow_cache = WorkflowCache()
+render_cache = WorkflowCache(max_size=RENDER_CACHE_SIZE)
+
+
+def invalidate_workflow(workflow_id: int) -> None:
+    """Invalidate every cache holding data derived from the workflow."""
+
+    workflow_cache.invalidate(workflow_id)
+    render_cache.invalidate(workflow_id)
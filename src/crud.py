@@ -1,6 +1,7 @@
 from sqlalchemy.orm import Session, joinedload
 
 from src import models
+from src.cache import invalidate_workflow
 from src.schemas import (
     NodeCreate,
     MessageNodeCreate,
@@ -44,6 +45,7 @@ def delete_workflow(db: Session, workflow_id: int) -> models.DBWorkflow:
     db_workflow = get_workflow(db, workflow_id)
     db.delete(db_workflow)
     db.commit()
+    invalidate_workflow(workflow_id)
     return db_workflow
 
 
@@ -55,6 +57,7 @@ def create_node(db: Session, node: NodeCreate) -> models.DBNode:
     db.add(db_node)
     db.commit()
     db.refresh(db_node)
+    invalidate_workflow(db_node.workflow_id)
 
     return db_node
 
@@ -75,6 +78,7 @@ def delete_node(db: Session, node_id: int) -> models.DBNode:
     ).filter(models.DBNode.id == node_id).first()
     db.delete(node)
     db.commit()
+    invalidate_workflow(node.workflow_id)
     return node
 
 
@@ -90,6 +94,7 @@ def create_message_node(
     db.add(db_message_node)
     db.commit()
     db.refresh(db_message_node)
+    invalidate_workflow(db_message_node.workflow_id)
 
     return db_message_node
 
@@ -98,10 +103,13 @@ def update_message_node(
         db: Session, node_id: int, data: MessageNodeCreate
 ) -> models.DBNode:
     node = get_node_by_id(db, node_id=node_id)
+    previous_workflow_id = node.workflow_id
     for var, value in vars(data).items():
         setattr(node, var, value)
     db.commit()
     db.refresh(node)
+    invalidate_workflow(previous_workflow_id)
+    invalidate_workflow(node.workflow_id)
     return node
 
 
@@ -116,6 +124,7 @@ def create_condition_node(
     db.add(db_condition_node)
     db.commit()
     db.refresh(db_condition_node)
+    invalidate_workflow(db_condition_node.workflow_id)
 
     return db_condition_node
 
@@ -124,10 +133,13 @@ def update_condition_node(
         db: Session, node_id: int, data: ConditionNodeCreate
 ) -> models.DBNode:
     node = get_node_by_id(db, node_id=node_id)
+    previous_workflow_id = node.workflow_id
     for var, value in vars(data).items():
         setattr(node, var, value)
     db.commit()
     db.refresh(node)
+    invalidate_workflow(previous_workflow_id)
+    invalidate_workflow(node.workflow_id)
     return node
 
 
@@ -141,5 +153,6 @@ def create_edge(db: Session, edge: EdgeCreate) -> models.DBEdge:
     db.add(db_edge)
     db.commit()
     db.refresh(db_edge)
+    invalidate_workflow(db_edge.workflow_id)
 
     return db_edge
@@ -0,0 +1,73 @@
+import asyncio
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+from enum import StrEnum, auto
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt  # noqa: E402
+import networkx as nx  # noqa: E402
+
+RENDER_WORKERS = int(os.getenv("RENDER_WORKERS", "2"))
+
+_render_pool: ProcessPoolExecutor | None = None
+
+
+class ImageFormat(StrEnum):
+    png = auto()
+    svg = auto()
+
+
+MEDIA_TYPES = {
+    ImageFormat.png: "image/png",
+    ImageFormat.svg: "image/svg+xml",
+}
+
+
+def draw_workflow_graph(
+        nodes: list[int], edges: list[tuple[int, int]], image_format: str
+) -> bytes:
+    """Draw the workflow graph and return the encoded image."""
+
+    graph = nx.DiGraph()
+    graph.add_nodes_from(nodes)
+    graph.add_edges_from(edges)
+
+    figure = plt.figure()
+    try:
+        pict = nx.spring_layout(graph, seed=0)  # Layout for the nodes
+        nx.draw(
+            graph, pict, ax=figure.gca(),
+            with_labels=True, node_size=700, node_color="skyblue"
+        )
+        buffer = io.BytesIO()
+        figure.savefig(buffer, format=image_format)
+    finally:
+        plt.close(figure)
+
+    return buffer.getvalue()
+
+
+def get_render_pool() -> ProcessPoolExecutor:
+    """Return the process pool used for drawing, creating it on first use."""
+
+    global _render_pool
+    if _render_pool is None:
+        _render_pool = ProcessPoolExecutor(max_workers=RENDER_WORKERS)
+    return _render_pool
+
+
+async def render_workflow_graph(graph: nx.DiGraph, image_format: str) -> bytes:
+    """Draw the graph in the render pool without blocking the event loop."""
+
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        get_render_pool(),
+        draw_workflow_graph,
+        list(graph.nodes),
+        list(graph.edges),
+        str(image_format),
+    )
@@ -1,6 +1,6 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Response
 from fastapi.params import Depends
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.schemas import (
     Workflow,
@@ -14,118 +14,163 @@ from src.schemas import (
     Edge,
     EdgeCreate,
 )
-from src import crud
-from dependencies import get_db
-from src.utils import execute_workflow_logic
+from src import async_crud
+from src.cache import render_cache, workflow_cache
+from dependencies import get_async_db
+from src.render import MEDIA_TYPES, ImageFormat, render_workflow_graph
+from src.utils import (
+    CompiledWorkflow,
+    compile_workflow,
+    execute_compiled_workflow
+)
 
 router = APIRouter(tags=["workflow_management"])
 
 
 @router.post("/workflows/", response_model=Workflow)
 async def create_workflow(
-        workflow: WorkflowCreate, db: Session = Depends(get_db)
+        workflow: WorkflowCreate, db: AsyncSession = Depends(get_async_db)
 ) -> Workflow:
     """Create a new workflow"""
-    return crud.create_workflow(db=db, workflow=workflow)
+    return await async_crud.create_workflow(db=db, workflow=workflow)
 
 
 @router.get("/workflows/", response_model=list[Workflow])
-async def read_all_workflows(db: Session = Depends(get_db)) -> list[Workflow]:
+async def read_all_workflows(db: AsyncSession = Depends(get_async_db)) -> list[Workflow]:
     """Return all workflows"""
-    return crud.get_all_workflows(db=db)
+    return await async_crud.get_all_workflows(db=db)
 
 
 @router.get("/workflows/{workflow_id}/", response_model=Workflow)
-async def read_workflow(workflow_id: int, db: Session = Depends(get_db)) -> Workflow:
+async def read_workflow(workflow_id: int, db: AsyncSession = Depends(get_async_db)) -> Workflow:
     """Return workflow by its id"""
-    return crud.get_workflow(db=db, workflow_id=workflow_id)
+    return await async_crud.get_workflow(db=db, workflow_id=workflow_id)
 
 
 @router.put("/workflows/{workflow_id}/", response_model=Workflow)
 async def update_workflow(
         workflow_id: int,
         workflow: WorkflowCreate,
-        db: Session = Depends(get_db)
+        db: AsyncSession = Depends(get_async_db)
 ) -> Workflow:
     """Update workflow by its id"""
-    return crud.update_workflow(db=db, workflow_id=workflow_id, workflow=workflow)
+    return await async_crud.update_workflow(db=db, workflow_id=workflow_id, workflow=workflow)
 
 
 @router.delete("/workflows/{workflow_id}/", response_model=Workflow)
-async def delete_workflow(workflow_id: int, db: Session = Depends(get_db)) -> Workflow:
-    return crud.delete_workflow(db=db, workflow_id=workflow_id)
+async def delete_workflow(workflow_id: int, db: AsyncSession = Depends(get_async_db)) -> Workflow:
+    return await async_crud.delete_workflow(db=db, workflow_id=workflow_id)
 
 
 @router.post("/nodes/", response_model=Node)
 async def create_node(
-        node: NodeCreate, db: Session = Depends(get_db)
+        node: NodeCreate, db: AsyncSession = Depends(get_async_db)
 ) -> Node:
     """Create a new node in the database (only for creating Start and End nodes)"""
-    return crud.create_node(db=db, node=node)
+    return await async_crud.create_node(db=db, node=node)
 
 
 @router.get("/nodes/", response_model=list[Node])
-async def read_all_nodes(db: Session = Depends(get_db)) -> list[Node]:
+async def read_all_nodes(db: AsyncSession = Depends(get_async_db)) -> list[Node]:
     """Returns all nodes in the database"""
-    return crud.get_all_nodes(db=db)
+    return await async_crud.get_all_nodes(db=db)
 
 
 @router.get("/nodes/{node_id}/", response_model=Node)
-async def read_node(node_id: int, db: Session = Depends(get_db)) -> Node:
+async def read_node(node_id: int, db: AsyncSession = Depends(get_async_db)) -> Node:
     """Returns a node by its id"""
-    node = crud.get_node_by_id(db=db, node_id=node_id)
+    node = await async_crud.get_node_by_id(db=db, node_id=node_id)
     if node is None:
         raise HTTPException(status_code=404, detail="Node not found")
     return node
 
 
 @router.delete("/nodes/{node_id}/", response_model=Node)
-async def delete_node(node_id: int, db: Session = Depends(get_db)) -> Node:
+async def delete_node(node_id: int, db: AsyncSession = Depends(get_async_db)) -> Node:
     """Deletes a node by its id"""
-    return crud.delete_node(db=db, node_id=node_id)
+    return await async_crud.delete_node(db=db, node_id=node_id)
 
 
 @router.post("/message_nodes/", response_model=MessageNode)
 async def create_message_node(
-        message_node: MessageNodeCreate, db: Session = Depends(get_db)
+        message_node: MessageNodeCreate, db: AsyncSession = Depends(get_async_db)
 ) -> MessageNode:
     """Create a new message node"""
-    return crud.create_message_node(db=db, message_node=message_node)
+    return await async_crud.create_message_node(db=db, message_node=message_node)
 
 
 @router.put("/message_nodes/{node_id}/", response_model=MessageNode)
 async def update_message_node(
-        node_id: int, data: MessageNodeCreate, db: Session = Depends(get_db)
+        node_id: int, data: MessageNodeCreate, db: AsyncSession = Depends(get_async_db)
 ) -> MessageNode:
     """Update a message node"""
-    return crud.update_message_node(db=db, node_id=node_id, data=data)
+    return await async_crud.update_message_node(db=db, node_id=node_id, data=data)
 
 
 @router.post("/condition_nodes/", response_model=ConditionNode)
 async def create_condition_node(
         condition_node: ConditionNodeCreate,
-        db: Session = Depends(get_db)
+        db: AsyncSession = Depends(get_async_db)
 ) -> ConditionNode:
     """Create a new condition node"""
-    return crud.create_condition_node(db=db, condition_node=condition_node)
+    return await async_crud.create_condition_node(db=db, condition_node=condition_node)
 
 
 @router.put("/condition_nodes/{node_id}/", response_model=ConditionNode)
 async def update_condition_node(
-        node_id: int, data: ConditionNodeCreate, db: Session = Depends(get_db)
+        node_id: int, data: ConditionNodeCreate, db: AsyncSession = Depends(get_async_db)
 ) -> ConditionNode:
     """Update a condition node"""
-    return crud.update_condition_node(db=db, node_id=node_id, data=data)
+    return await async_crud.update_condition_node(db=db, node_id=node_id, data=data)
 
 
 @router.post("/edges/", response_model=Edge)
-async def create_edge(edge: EdgeCreate, db: Session = Depends(get_db)):
+async def create_edge(edge: EdgeCreate, db: AsyncSession = Depends(get_async_db)):
     """Create a new edge between two nodes"""
-    return crud.create_edge(db=db, edge=edge)
+    return await async_crud.create_edge(db=db, edge=edge)
+
+
+async def get_compiled_workflow(
+        db: AsyncSession, workflow_id: int
+) -> CompiledWorkflow:
+    """Return the compiled workflow from the cache, compiling it on a miss"""
+    compiled = workflow_cache.get(workflow_id)
+    if compiled is None:
+        version = workflow_cache.version(workflow_id)
+        workflow = await async_crud.get_workflow(db, workflow_id)
+        if workflow is None:
+            raise HTTPException(status_code=404, detail="Workflow not found")
+        # Nodes and edges are lazy loaded while the graph is built
+        compiled = await db.run_sync(lambda _: compile_workflow(workflow))
+        workflow_cache.put(workflow_id, version, compiled)
+    return compiled
 
 
 @router.get("/workflows/{workflow_id}/execute/")
-async def execute_workflow(workflow_id: int, db: Session = Depends(get_db)) -> list:
+async def execute_workflow(workflow_id: int, db: AsyncSession = Depends(get_async_db)) -> list:
     """Creates a new graph, adds all the nodes and edges to the graph and looking for the shortest path"""
-    workflow = crud.get_workflow(db, workflow_id)
-    return execute_workflow_logic(workflow)
+    return execute_compiled_workflow(await get_compiled_workflow(db, workflow_id))
+
+
+@router.get(
+    "/workflows/{workflow_id}/render.{image_format}",
+    response_class=Response,
+    responses={200: {"content": dict.fromkeys(MEDIA_TYPES.values(), {})}},
+)
+async def render_workflow(
+        workflow_id: int, image_format: ImageFormat, db: AsyncSession = Depends(get_async_db)
+) -> Response:
+    """Renders the workflow graph as a PNG or SVG image"""
+    image = render_cache.get(workflow_id, image_format)
+    if image is None:
+        version = render_cache.version(workflow_id)
+        compiled = await get_compiled_workflow(db, workflow_id)
+        image = await render_workflow_graph(compiled.graph, image_format)
+        render_cache.put(workflow_id, version, image, image_format)
+    return Response(content=image, media_type=MEDIA_TYPES[image_format])
+
+
+@router.get("/cache/stats/")
+async def read_cache_stats() -> dict:
+    """Returns hit and miss counters of the compiled workflow cache"""
+    return workflow_cache.stats()
@@ -1,5 +1,6 @@
+from dataclasses import dataclass
+
 import networkx as nx
-import matplotlib.pyplot as plt
 
 from src.validation import edges_validation
 from src.schemas import Workflow
@@ -92,19 +93,33 @@ def create_path(graph: nx.DiGraph, start: int, end: int) -> list:
     return result
 
 
-def execute_workflow_logic(workflow: Workflow) -> list:
-    """Execute the workflow logic and return the final path."""
+@dataclass(frozen=True)
+class CompiledWorkflow:
+    """Validated, immutable execution plan of a workflow."""
+
+    graph: nx.DiGraph
+    start: int
+    end: int
+
 
-    graph = construct_workflow_graph(workflow)
+def compile_workflow(workflow: Workflow) -> CompiledWorkflow:
+    """Build, validate and freeze the workflow graph."""
 
+    graph = nx.freeze(construct_workflow_graph(workflow))
     start_and_end = find_start_and_end_nodes(graph)
 
-    final_path = create_path(graph, start_and_end["start"], start_and_end["end"])
+    return CompiledWorkflow(
+        graph=graph, start=start_and_end["start"], end=start_and_end["end"]
+    )
 
-    pict = nx.spring_layout(graph)  # Layout for the nodes
-    nx.draw(graph, pict, with_labels=True, node_size=700, node_color="skyblue")
 
-    # Display the graph
-    plt.show()
+def execute_compiled_workflow(compiled: CompiledWorkflow) -> list:
+    """Execute a compiled workflow and return the final path."""
+
+    return create_path(compiled.graph, compiled.start, compiled.end)
+
+
+def execute_workflow_logic(workflow: Workflow) -> list:
+    """Execute the workflow logic and return the final path."""
 
-    return final_path
+    return execute_compiled_workflow(compile_workflow(workflow))
@@ -1,9 +1,16 @@
-from src import crud
+from src import async_crud, crud
 from src.schemas import WorkflowCreate, NodeCreate, EdgeCreate, MessageNodeCreate, ConditionNodeCreate
 import pytest
+from httpx import ASGITransport, AsyncClient
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from dependencies import get_async_db
+from main import app
 from src.models import DBWorkflow, Base, DBNode
+from src.cache import WorkflowCache, render_cache, workflow_cache
+from src.render import draw_workflow_graph
 from src.utils import execute_workflow_logic
 
 
@@ -11,6 +18,9 @@ SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
 engine = create_engine(SQLALCHEMY_DATABASE_URL)
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+ASYNC_SQLALCHEMY_DATABASE_URL = "sqlite+aiosqlite://"
+async_engine = create_async_engine(ASYNC_SQLALCHEMY_DATABASE_URL, poolclass=StaticPool)
+
 
 @pytest.fixture(scope="session")
 def db_engine():
@@ -31,6 +41,31 @@ def db_session(db_engine):
     connection.close()
 
 
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+async def async_db_session(anyio_backend):
+    async with async_engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    async with AsyncSession(async_engine, expire_on_commit=False) as session:
+        yield session
+    async with async_engine.begin() as connection:
+        await connection.run_sync(Base.metadata.drop_all)
+
+
+@pytest.fixture
+async def client(async_db_session):
+    app.dependency_overrides[get_async_db] = lambda: async_db_session
+    workflow_cache.clear()
+    render_cache.clear()
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        yield client
+    app.dependency_overrides.clear()
+
+
 class TestWorkflow:
     def setup_method(self, method):
         self.workflow_data_1 = WorkflowCreate(name="test_workflow_1")
@@ -403,3 +438,116 @@ class TestEdge:
         result = execute_workflow_logic(workflow)
 
         assert result == [1, 2, 3, 5, 6, 8]
+
+
+class TestWorkflowCache:
+    def test_hit_and_miss_counters(self):
+        cache = WorkflowCache(max_size=2)
+
+        assert cache.get(1) is None
+        cache.put(1, cache.version(1), "compiled")
+        assert cache.get(1) == "compiled"
+
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    def test_lru_eviction(self):
+        cache = WorkflowCache(max_size=2)
+        cache.put(1, 0, "first")
+        cache.put(2, 0, "second")
+        cache.get(1)
+        cache.put(3, 0, "third")
+
+        assert cache.get(1) == "first"
+        assert cache.get(2) is None
+        assert cache.get(3) == "third"
+
+    def test_stale_version_is_not_stored(self):
+        cache = WorkflowCache()
+        version = cache.version(1)
+        cache.invalidate(1)
+        cache.put(1, version, "stale")
+
+        assert cache.get(1) is None
+
+    def test_variants_are_invalidated_together(self):
+        cache = WorkflowCache()
+        cache.put(1, 0, b"png", "png")
+        cache.put(1, 0, b"svg", "svg")
+        cache.invalidate(1)
+
+        assert cache.get(1, "png") is None
+        assert cache.get(1, "svg") is None
+
+    def test_crud_invalidates_workflow(self, db_session):
+        workflow = crud.create_workflow(db_session, WorkflowCreate(name="cached"))
+        workflow_cache.put(workflow.id, workflow_cache.version(workflow.id), "compiled")
+
+        crud.create_node(db_session, NodeCreate(node_type="start", workflow_id=workflow.id))
+
+        assert workflow_cache.get(workflow.id) is None
+
+
+class TestRender:
+    def test_draw_png(self):
+        result = draw_workflow_graph([1, 2], [(1, 2)], "png")
+
+        assert result.startswith(b"\x89PNG")
+
+    def test_draw_svg(self):
+        result = draw_workflow_graph([1, 2], [(1, 2)], "svg")
+
+        assert b"<svg" in result
+
+
+@pytest.mark.anyio
+class TestAsyncCrud:
+    async def test_create_and_get_workflow(self, async_db_session):
+        created = await async_crud.create_workflow(async_db_session, WorkflowCreate(name="async"))
+        result = await async_crud.get_workflow(async_db_session, created.id)
+
+        assert result.name == "async"
+
+    async def test_get_all_nodes_loads_workflow(self, async_db_session):
+        workflow = await async_crud.create_workflow(async_db_session, WorkflowCreate(name="async"))
+        await async_crud.create_node(async_db_session, NodeCreate(node_type="start", workflow_id=workflow.id))
+
+        result = await async_crud.get_all_nodes(async_db_session)
+
+        assert [node.workflow.name for node in result] == ["async"]
+
+    async def test_delete_workflow_with_nodes(self, async_db_session):
+        workflow = await async_crud.create_workflow(async_db_session, WorkflowCreate(name="async"))
+        await async_crud.create_node(async_db_session, NodeCreate(node_type="start", workflow_id=workflow.id))
+
+        await async_crud.delete_workflow(async_db_session, workflow.id)
+
+        assert await async_crud.get_all_workflows(async_db_session) == []
+
+
+@pytest.mark.anyio
+class TestRouter:
+    async def test_execute_workflow(self, client):
+        workflow = (await client.post("/workflows/", json={"name": "http"})).json()
+        start = (await client.post("/nodes/", json={"node_type": "start", "workflow_id": workflow["id"]})).json()
+        message = (await client.post("/message_nodes/", json={
+            "text": "hello", "status": "sent", "workflow_id": workflow["id"]
+        })).json()
+        end = (await client.post("/nodes/", json={"node_type": "end", "workflow_id": workflow["id"]})).json()
+        for start_node_id, end_node_id in [(start["id"], message["id"]), (message["id"], end["id"])]:
+            await client.post("/edges/", json={
+                "name": "",
+                "start_node_id": start_node_id,
+                "end_node_id": end_node_id,
+                "workflow_id": workflow["id"]
+            })
+
+        response = await client.get(f"/workflows/{workflow['id']}/execute/")
+
+        assert response.status_code == 200
+        assert response.json() == [start["id"], message["id"], end["id"]]
+
+    async def test_execute_missing_workflow(self, client):
+        response = await client.get("/workflows/1/execute/")
+
+        assert response.status_code == 404